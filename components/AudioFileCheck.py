@@ -1,134 +1,274 @@
 from __future__ import annotations
 
+import mmap
 import os
-import wave
-from pathlib import Path
+import struct
+from dataclasses import dataclass
+from typing import BinaryIO, Optional
 import audioop
 
+import numpy as np
 
-def is_wav_silent(file_path: str, chunk_frames: int = 4096) -> bool:
-    """
-    Return True if a WAV file contains only silence.
-    For 8-bit PCM, silence is 0x80. For other PCM widths, silence is 0x00.
-    """
-    path = Path(file_path)
-    if path.suffix.lower() != ".wav":
-        raise ValueError(f"Unsupported file type: {path.suffix}")
+WAVE_FORMAT_PCM = 0x0001
 
-    with wave.open(str(path), "rb") as wav:
-        sample_width = wav.getsampwidth()
-        total_frames = wav.getnframes()
-        if total_frames == 0:
-            return True
+_U32 = struct.Struct("<I")
+# wFormatTag, nChannels, nSamplesPerSec, nAvgBytesPerSec, nBlockAlign, wBitsPerSample
+_FMT = struct.Struct("<HHIIHH")
 
-        if sample_width == 1:
-            silent_byte = b"\x80"
-        else:
-            silent_byte = b"\x00"
 
-        while True:
-            frames = wav.readframes(chunk_frames)
-            if not frames:
-                break
-            if sample_width == 1:
-                if any(b != 0x80 for b in frames):
-                    return False
-            else:
-                if any(b != 0x00 for b in frames):
-                    return False
+@dataclass
+class WavContext:
+    """Header facts of one WAV file, collected once and shared by all checks."""
+    path: str
+    file_size: int
+    riff_size: Optional[int] = None
+    format_tag: Optional[int] = None
+    channels: int = 0
+    sample_width: int = 0
+    data_offset: Optional[int] = None
+    data_size: int = 0
+    num_loops: int = 0
 
-    return True
+    @property
+    def frame_size(self) -> int:
+        return self.sample_width * self.channels
 
+    @property
+    def total_frames(self) -> int:
+        return self.data_size // self.frame_size if self.frame_size else 0
 
-def wav_riff_size_matches_file(file_path: str) -> bool:
+
+def _ensure_wav(file_path: str) -> str:
+    """Return the path if it names a .wav file, else raise ValueError."""
+    ext = os.path.splitext(file_path)[1]
+    if ext.lower() != ".wav":
+        raise ValueError(f"Unsupported file type: {ext}")
+    return file_path
+
+
+def scan_wav(file_path: str) -> WavContext:
     """
-    Return True if the RIFF header size matches the actual file size.
-    RIFF size should equal (file_size - 8).
+    Open a WAV file once and collect the RIFF, fmt, data and smpl chunk facts.
+    Files that are not RIFF/WAVE still yield a context (with riff_size None),
+    so header checks can report them; sample checks raise on them instead.
+    """
+    path = _ensure_wav(file_path)
+    with open(path, "rb") as f:
+        # Size from the open descriptor: one open and no separate stat by path.
+        ctx = WavContext(path=path, file_size=os.fstat(f.fileno()).st_size)
+        if ctx.file_size < 12:
+            return ctx
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            _scan_chunks(ctx, mm)
+    return ctx
+
+
+def _scan_chunks(ctx: WavContext, mm: mmap.mmap) -> None:
+    """Fill `ctx` from the RIFF header and chunks of a mapped WAV file."""
+    if mm[:4] != b"RIFF" or mm[8:12] != b"WAVE":
+        return
+    ctx.riff_size = _U32.unpack_from(mm, 4)[0]
+
+    smpl_seen = False
+    # Iterate RIFF chunks by offset in the mapped file (no seek/read per chunk)
+    offset = 12
+    while offset + 8 <= len(mm):
+        chunk_id = mm[offset:offset + 4]
+        chunk_size = _U32.unpack_from(mm, offset + 4)[0]
+        chunk_start = offset + 8
+
+        if chunk_id == b"fmt " and ctx.data_offset is None and chunk_size >= 16:
+            if chunk_start + _FMT.size <= len(mm):
+                ctx.format_tag, ctx.channels, _rate, _byte_rate, _align, bits = _FMT.unpack_from(mm, chunk_start)
+                ctx.sample_width = (bits + 7) // 8
+        elif chunk_id == b"data" and ctx.data_offset is None and ctx.format_tag is not None:
+            ctx.data_offset = chunk_start
+            ctx.data_size = chunk_size
+        elif chunk_id == b"smpl" and not smpl_seen:
+            # Only the first sampler chunk counts.
+            smpl_seen = True
+            if chunk_size >= 36 and chunk_start + 36 <= len(mm):
+                ctx.num_loops = _U32.unpack_from(mm, chunk_start + 28)[0]
+
+        # Skip chunk data (plus padding byte if size is odd)
+        offset = chunk_start + chunk_size + (chunk_size & 1)
+
+
+def _require_pcm(ctx: WavContext) -> None:
+    """Raise ValueError unless the context describes readable PCM sample data."""
+    if ctx.format_tag is None or ctx.data_offset is None:
+        raise ValueError(f"Missing fmt or data chunk: {os.path.basename(ctx.path)}")
+    if ctx.format_tag != WAVE_FORMAT_PCM:
+        raise ValueError(f"Unsupported WAV format: {ctx.format_tag:#06x}")
+    if ctx.channels <= 0:
+        raise ValueError(f"Unsupported channel count: {ctx.channels}")
+    if ctx.sample_width not in _DECODERS:
+        raise ValueError(f"Unsupported sample width: {ctx.sample_width}")
+
+
+def _read_frames(ctx: WavContext, f: BinaryIO, start_frame: int, frame_count: int) -> bytes:
+    """
+    Read `frame_count` frames starting at `start_frame`.
+    Raises ValueError if the file ends before them (data chunk cut short).
     """
-    path = Path(file_path)
-    if path.suffix.lower() != ".wav":
-        raise ValueError(f"Unsupported file type: {path.suffix}")
+    f.seek(ctx.data_offset + start_frame * ctx.frame_size)
+    size = frame_count * ctx.frame_size
+    data = f.read(size)
+    if len(data) < size:
+        raise ValueError(f"Truncated data chunk: {os.path.basename(ctx.path)}")
+    return data
 
-    file_size = os.path.getsize(path)
-    if file_size < 12:
-        return False
 
-    with open(path, "rb") as f:
-        header = f.read(12)
+def _map_data(ctx: WavContext) -> np.ndarray:
+    """
+    Return the whole frames of the data chunk as a zero-copy uint8 array.
+    The file is memory-mapped; the mapping is released with the array.
+    """
+    with open(ctx.path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    size = min(ctx.total_frames * ctx.frame_size, len(mm) - ctx.data_offset)
+    size -= size % ctx.frame_size
+    return np.frombuffer(mm, dtype=np.uint8, count=size, offset=ctx.data_offset)
 
-    if header[:4] != b"RIFF" or header[8:12] != b"WAVE":
-        return False
 
-    riff_size = int.from_bytes(header[4:8], byteorder="little", signed=False)
-    return riff_size == (file_size - 8)
+def _chunk_peak(frames: bytes, sample_width: int) -> int:
+    """Return the maximum absolute sample value in a block of PCM data."""
+    if sample_width == 1:
+        # 8-bit PCM is unsigned and centered at 128.
+        frames = audioop.bias(frames, 1, -128)
+    return audioop.max(frames, sample_width)
+
+
+def _unpack_s24_le(buf: bytes) -> np.ndarray:
+    """Decode packed little-endian signed 24-bit samples into an int32 array."""
+    u8 = np.frombuffer(buf, dtype=np.uint8).reshape(-1, 3)
+    # The high byte carries the sign, so reinterpret it as int8 before shifting.
+    return (
+        u8[:, 0].astype(np.int32)
+        | (u8[:, 1].astype(np.int32) << 8)
+        | (u8[:, 2].view(np.int8).astype(np.int32) << 16)
+    )
+
+
+def _decode_u8(data: bytes, count: int) -> np.ndarray:
+    # 8-bit PCM is unsigned and centered at 128.
+    return np.frombuffer(data, dtype=np.uint8, count=count).astype(np.int32) - 128
+
+
+def _decode_s16(data: bytes, count: int) -> np.ndarray:
+    return np.frombuffer(data, dtype="<i2", count=count).astype(np.int32)
+
+
+def _decode_s24(data: bytes, count: int) -> np.ndarray:
+    return _unpack_s24_le(data[:count * 3])
+
+
+def _decode_s32(data: bytes, count: int) -> np.ndarray:
+    # int64 so that abs() of the most negative sample cannot overflow.
+    return np.frombuffer(data, dtype="<i4", count=count).astype(np.int64)
+
+
+# Sample decoders by sample width; samples up to 24 bits fit int32, abs() included.
+_DECODERS = {1: _decode_u8, 2: _decode_s16, 3: _decode_s24, 4: _decode_s32}
+
 
+def _pcm_samples(data: bytes, sample_width: int, channels: int) -> np.ndarray:
+    """Decode interleaved PCM bytes into a (frames, channels) signed array."""
+    frame_count = len(data) // (sample_width * channels)
+    samples = _DECODERS[sample_width](data, frame_count * channels)
+    return samples.reshape(frame_count, channels)
 
-def wav_has_loop_points(file_path: str) -> bool:
+
+def _min_frame_peak(data: bytes, sample_width: int, channels: int) -> int:
+    """Return the smallest per-frame peak (max over channels) across the frames in `data`."""
+    samples = _pcm_samples(data, sample_width, channels)
+    return int(np.abs(samples).max(axis=1).min())
+
+
+@dataclass
+class PcmScan:
+    """Verdicts of one pass over the sample data; None for checks not requested."""
+    silent: Optional[bool] = None
+    clipping: Optional[bool] = None
+
+
+def scan_pcm(
+    wav: WavContext,
+    silence: bool = True,
+    clipping: bool = True,
+    clip_threshold_ratio: float = 0.999,
+    min_clipped_samples: int = 3,
+    chunk_frames: int = 262144,
+) -> PcmScan:
     """
-    Return True if a WAV file declares loop points in a 'smpl' chunk.
-    This checks NumSampleLoops > 0 in the sampler chunk.
+    Run the silence and clipping checks in a single pass over the data chunk.
+
+    Each block is reduced to its peak once; the pass stops as soon as every
+    requested verdict is settled. Typical one-shot samples fit in a single
+    block of `chunk_frames`, longer files are still scanned in bounded blocks.
     """
-    path = Path(file_path)
-    if path.suffix.lower() != ".wav":
-        raise ValueError(f"Unsupported file type: {path.suffix}")
+    _require_pcm(wav)
+    sample_width = wav.sample_width
+    channels = wav.channels
+
+    threshold_ratio = min(1.0, max(0.0, clip_threshold_ratio))
+    min_hits = max(1, int(min_clipped_samples))
+    max_amplitude = 127 if sample_width == 1 else (1 << (8 * sample_width - 1)) - 1
+    threshold = max(1, int(max_amplitude * threshold_ratio))
+
+    silent = True
+    clipped_hits = 0
+    if wav.total_frames == 0:
+        # Empty data chunk: nothing to map or scan.
+        return PcmScan(silent=True if silence else None, clipping=False if clipping else None)
+
+    data = _map_data(wav)
+    block = chunk_frames * wav.frame_size
+    for start in range(0, len(data), block):
+        frames = data[start:start + block]
+        peak = _chunk_peak(frames, sample_width)
+        if peak != 0:
+            silent = False
+        # Only blocks that get close to full scale need a per-sample count.
+        if clipping and peak >= threshold:
+            samples = _pcm_samples(frames, sample_width, channels)
+            clipped_hits += int(np.count_nonzero(np.abs(samples) >= threshold))
+
+        if (not silence or not silent) and (not clipping or clipped_hits >= min_hits):
+            break
+
+    return PcmScan(
+        silent=silent if silence else None,
+        clipping=clipped_hits >= min_hits if clipping else None,
+    )
+
+
+def is_wav_silent(wav: WavContext, chunk_frames: int = 262144) -> bool:
+    """
+    Return True if a WAV file contains only silence.
+    For 8-bit PCM, silence is 0x80. For other PCM widths, silence is 0x00.
+    """
+    return scan_pcm(wav, silence=True, clipping=False, chunk_frames=chunk_frames).silent
 
-    file_size = os.path.getsize(path)
-    if file_size < 12:
-        return False
 
-    with open(path, "rb") as f:
-        header = f.read(12)
-        if header[:4] != b"RIFF" or header[8:12] != b"WAVE":
-            return False
-
-        # Iterate RIFF chunks
-        while True:
-            chunk_header = f.read(8)
-            if len(chunk_header) < 8:
-                break
-            chunk_id = chunk_header[:4]
-            chunk_size = int.from_bytes(chunk_header[4:8], byteorder="little", signed=False)
-
-            if chunk_id == b"smpl":
-                if chunk_size < 36:
-                    return False
-                smpl_data = f.read(36)
-                if len(smpl_data) < 36:
-                    return False
-                num_loops = int.from_bytes(smpl_data[28:32], byteorder="little", signed=False)
-                return num_loops > 0
-
-            # Skip chunk data (plus padding byte if size is odd)
-            skip = chunk_size + (chunk_size % 2)
-            f.seek(skip, os.SEEK_CUR)
-
-    return False
-
-
-def _frame_peak_abs(frame_bytes: bytes, sample_width: int, channels: int) -> int:
-    """Return the maximum absolute sample value in one PCM frame."""
-    if len(frame_bytes) < sample_width * channels:
-        return 0
-
-    peak = 0
-    for ch in range(channels):
-        start = ch * sample_width
-        sample = frame_bytes[start:start + sample_width]
-        if sample_width == 1:
-            # 8-bit PCM is unsigned and centered at 128.
-            value = sample[0] - 128
-        elif sample_width == 3:
-            # 24-bit PCM sign extension.
-            sign = b"\xff" if sample[2] & 0x80 else b"\x00"
-            value = int.from_bytes(sample + sign, byteorder="little", signed=True)
-        else:
-            value = int.from_bytes(sample, byteorder="little", signed=True)
-        peak = max(peak, abs(value))
-    return peak
+def wav_riff_size_matches_file(wav: WavContext) -> bool:
+    """
+    Return True if the RIFF header size matches the actual file size.
+    RIFF size should equal (file_size - 8).
+    """
+    return wav.riff_size is not None and wav.riff_size == (wav.file_size - 8)
+
+
+def wav_has_loop_points(wav: WavContext) -> bool:
+    """
+    Return True if a WAV file declares loop points in a 'smpl' chunk.
+    This checks NumSampleLoops > 0 in the sampler chunk.
+    """
+    return wav.num_loops > 0
 
 
 def wav_has_hard_edges(
-    file_path: str,
+    wav: WavContext,
     zero_threshold_ratio: float = 0.005,
     edge_window_frames: int = 64,
 ) -> bool:
@@ -138,49 +278,34 @@ def wav_has_hard_edges(
     This is a simple click-risk check (missing near-zero edge), not a full
     clipping/distortion analysis over the entire file.
     """
-    path = Path(file_path)
-    if path.suffix.lower() != ".wav":
-        raise ValueError(f"Unsupported file type: {path.suffix}")
-
-    with wave.open(str(path), "rb") as wav:
-        if wav.getcomptype() != "NONE":
-            raise ValueError(f"Unsupported WAV compression: {wav.getcomptype()}")
-
-        sample_width = wav.getsampwidth()
-        channels = wav.getnchannels()
-        total_frames = wav.getnframes()
-        if total_frames == 0:
-            return False
-        if sample_width not in (1, 2, 3, 4):
-            raise ValueError(f"Unsupported sample width: {sample_width}")
+    _require_pcm(wav)
+    sample_width = wav.sample_width
+    channels = wav.channels
+    total_frames = wav.total_frames
+    if total_frames == 0:
+        return False
 
-        max_amplitude = 127 if sample_width == 1 else (1 << (8 * sample_width - 1)) - 1
-        threshold = max(1, int(max_amplitude * max(0.0, zero_threshold_ratio)))
-        window = max(1, min(int(edge_window_frames), total_frames))
+    max_amplitude = 127 if sample_width == 1 else (1 << (8 * sample_width - 1)) - 1
+    threshold = max(1, int(max_amplitude * max(0.0, zero_threshold_ratio)))
+    window = max(1, min(int(edge_window_frames), total_frames))
 
-        start_data = wav.readframes(window)
-        wav.setpos(total_frames - window)
-        end_data = wav.readframes(window)
+    with open(wav.path, "rb") as f:
+        start_data = _read_frames(wav, f, 0, window)
+        end_data = _read_frames(wav, f, total_frames - window, window)
 
-        frame_size = sample_width * channels
-        start_min_peak = max_amplitude
-        end_min_peak = max_amplitude
-        for i in range(window):
-            s_frame = start_data[i * frame_size:(i + 1) * frame_size]
-            e_frame = end_data[i * frame_size:(i + 1) * frame_size]
-            start_min_peak = min(start_min_peak, _frame_peak_abs(s_frame, sample_width, channels))
-            end_min_peak = min(end_min_peak, _frame_peak_abs(e_frame, sample_width, channels))
+    start_min_peak = min(max_amplitude, _min_frame_peak(start_data, sample_width, channels))
+    end_min_peak = min(max_amplitude, _min_frame_peak(end_data, sample_width, channels))
 
-        no_near_zero_at_start = start_min_peak > threshold
-        no_near_zero_at_end = end_min_peak > threshold
-        return no_near_zero_at_start or no_near_zero_at_end
+    no_near_zero_at_start = start_min_peak > threshold
+    no_near_zero_at_end = end_min_peak > threshold
+    return no_near_zero_at_start or no_near_zero_at_end
 
 
 def wav_has_clipping(
-    file_path: str,
+    wav: WavContext,
     clip_threshold_ratio: float = 0.999,
     min_clipped_samples: int = 3,
-    chunk_frames: int = 4096,
+    chunk_frames: int = 262144,
 ) -> bool:
     """
     Return True if a WAV likely contains digital clipping.
@@ -188,61 +313,11 @@ def wav_has_clipping(
     Clipping is flagged when at least `min_clipped_samples` samples reach
     (or exceed) `clip_threshold_ratio` of full scale.
     """
-    path = Path(file_path)
-    if path.suffix.lower() != ".wav":
-        raise ValueError(f"Unsupported file type: {path.suffix}")
-
-    with wave.open(str(path), "rb") as wav:
-        if wav.getcomptype() != "NONE":
-            raise ValueError(f"Unsupported WAV compression: {wav.getcomptype()}")
-
-        sample_width = wav.getsampwidth()
-        channels = wav.getnchannels()
-        if sample_width not in (1, 2, 3, 4):
-            raise ValueError(f"Unsupported sample width: {sample_width}")
-        if channels <= 0:
-            return False
-
-        threshold_ratio = min(1.0, max(0.0, clip_threshold_ratio))
-        min_hits = max(1, int(min_clipped_samples))
-        max_amplitude = 127 if sample_width == 1 else (1 << (8 * sample_width - 1)) - 1
-        threshold = max(1, int(max_amplitude * threshold_ratio))
-
-        frame_size = sample_width * channels
-        clipped_hits = 0
-
-        while True:
-            frames = wav.readframes(chunk_frames)
-            if not frames:
-                break
-            # Fast path: skip whole chunk when no sample gets close to threshold.
-            if sample_width == 1:
-                signed_frames = audioop.bias(frames, 1, -128)
-                chunk_peak = audioop.max(signed_frames, 1)
-            else:
-                chunk_peak = audioop.max(frames, sample_width)
-            if chunk_peak < threshold:
-                continue
-
-            frame_count = len(frames) // frame_size
-
-            for i in range(frame_count):
-                base = i * frame_size
-                for ch in range(channels):
-                    start = base + ch * sample_width
-                    sample = frames[start:start + sample_width]
-
-                    if sample_width == 1:
-                        value = sample[0] - 128
-                    elif sample_width == 3:
-                        sign = b"\xff" if sample[2] & 0x80 else b"\x00"
-                        value = int.from_bytes(sample + sign, byteorder="little", signed=True)
-                    else:
-                        value = int.from_bytes(sample, byteorder="little", signed=True)
-
-                    if abs(value) >= threshold:
-                        clipped_hits += 1
-                        if clipped_hits >= min_hits:
-                            return True
-
-    return False
+    return scan_pcm(
+        wav,
+        silence=False,
+        clipping=True,
+        clip_threshold_ratio=clip_threshold_ratio,
+        min_clipped_samples=min_clipped_samples,
+        chunk_frames=chunk_frames,
+    ).clipping
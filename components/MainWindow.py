@@ -1,26 +1,35 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import List
 import os, sys
 
 from PySide6.QtCore import Qt, QMimeData, QSettings
-from PySide6.QtGui import QDragEnterEvent, QDropEvent, QPixmap, QIcon, QColor, QFont, QFontDatabase
-from PySide6.QtSvgWidgets import QSvgWidget
+from PySide6.QtGui import (
+    QDragEnterEvent, QDropEvent, QShowEvent, QPixmap, QIcon, QColor, QFont, QFontDatabase, QImage, QPainter,
+    QTextDocument
+)
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QLabel, QVBoxLayout, QHBoxLayout,
-    QProgressBar, QPushButton, QComboBox, QStackedLayout, QSizePolicy, QGraphicsColorizeEffect,
+    QProgressBar, QPushButton, QComboBox, QStackedLayout, QSizePolicy,
     QTextEdit
 )
 
-from pathlib import Path
-
-from components.Threads import AudioFileCheckThread, FileCheckThread
 from components.AudioFileSettingsDialog import AudioFileSettingsDialog
-from components.SchemaSettingsDialog import SchemaSettingsDialog, SCHEMA_PRESETS
+from components.SchemaSettingsDialog import SchemaSettingsDialog, matching_preset_name
 from utils.paths import resource_path, get_primary_color
 
 
+SKIPPED_FILES = {".DS_Store"}
+# Concurrent walkers for dropped items; the walk is I/O bound.
+COLLECT_WORKERS = 8
+
+# Tinted SVG renders by (path, color, size, device pixel ratio).
+_TINTED_SVG_CACHE: dict[tuple[str, str, int, float], QPixmap] = {}
+
+
 def place_widget(widget: QWidget, stretch: int, alignment: Qt.AlignmentFlag) -> QWidget:
     """Helper to center/align a widget inside another container."""
     wrapper = QWidget()
@@ -29,6 +38,61 @@ def place_widget(widget: QWidget, stretch: int, alignment: Qt.AlignmentFlag) ->
     lay.addWidget(widget, stretch, alignment)
     return wrapper
 
+def tinted_svg_pixmap(svg_path: str, color: str, size: int, dpr: float = 1.0) -> QPixmap:
+    """Render an SVG once into a pixmap filled with `color` (alpha kept) and cache it."""
+    key = (svg_path, color, size, dpr)
+    pixmap = _TINTED_SVG_CACHE.get(key)
+    if pixmap is None:
+        from PySide6.QtSvg import QSvgRenderer  # only needed for this one-time render
+
+        pixels = round(size * dpr)
+        image = QImage(pixels, pixels, QImage.Format.Format_ARGB32_Premultiplied)
+        image.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(image)
+        QSvgRenderer(svg_path).render(painter)
+        # Keep the icon's shape, replace its colors.
+        painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_SourceIn)
+        painter.fillRect(image.rect(), QColor(color))
+        painter.end()
+        pixmap = QPixmap.fromImage(image)
+        pixmap.setDevicePixelRatio(dpr)
+        _TINTED_SVG_CACHE[key] = pixmap
+    return pixmap
+
+@lru_cache(maxsize=1)
+def available_font_families() -> frozenset[str]:
+    """Installed font families; enumerating system fonts is slow, so do it once."""
+    return frozenset(QFontDatabase.families())
+
+def collect_input_paths(top: str) -> List[str]:
+    """Collect the files of one dropped file/folder (see MainWindow.collect_paths)."""
+    out: List[str] = []
+    # Depth-first walk on os.scandir; DirEntry caches the file type,
+    # so no extra stat() per entry. Same order as os.walk(topdown=True).
+    stack = [top]
+    while stack:
+        folder = stack.pop()
+        subdirs = []
+        try:
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        # Like os.walk, symlinked folders are not followed.
+                        if not entry.is_symlink():
+                            subdirs.append(entry.path)
+                    elif entry.name not in SKIPPED_FILES:
+                        out.append(entry.path)
+        except NotADirectoryError:
+            # A dropped file rather than a folder.
+            if folder == top and os.path.basename(top) not in SKIPPED_FILES:
+                out.append(top)
+            continue
+        except OSError:
+            # Missing or unreadable; the caller drops it silently.
+            continue
+        stack.extend(reversed(subdirs))
+    return out
+
 @dataclass
 class MainWindow(QMainWindow):
     """Minimal DnD window using PySide6.
@@ -66,7 +130,8 @@ class MainWindow(QMainWindow):
         super().__init__()
         self.settings = QSettings("Sonu", "CoPilot")
         self.thread = None
-        self.threads = []
+        # Last report document handed over by a worker; the editor shows it.
+        self._report_doc = None
         self.filename_summary_text = ""
         self.setWindowTitle("Sonu Co-Pilot")
         print(f"[INFO] Application started from: {resource_path('.')}")
@@ -81,9 +146,9 @@ class MainWindow(QMainWindow):
         root = QVBoxLayout(self.central)
         root.setContentsMargins(0, 0, 0, 0)
 
-        # --- Drop image / label
+        # --- Drop image / label (filled in on first show, see showEvent)
         self.drop_panel = QWidget(self)
-        self.createDropPanel(self.drop_panel)
+        self._drop_panel_built = False
         # self.drop_label = QLabel(self)
 		# drop_img_path = resource_path("icons/drop-files.png")
 		# pm = QPixmap(str(drop_img_path))
@@ -131,7 +196,7 @@ class MainWindow(QMainWindow):
         mono.setFixedPitch(True)
         # Prefer common monospace fonts if available.
         for family in ("Monaco", "Menlo", "Consolas", "Courier New"):
-            if family in QFontDatabase.families():
+            if family in available_font_families():
                 mono.setFamily(family)
                 print(f"[INFO] Using monospace font: {family}")
                 break
@@ -196,7 +261,6 @@ class MainWindow(QMainWindow):
         }
         self._load_schema_settings()
         self._load_audio_check_settings()
-        self._update_active_preset_label()
 
     def createDropPanel(self, panel: QWidget):
         col = QVBoxLayout(panel)
@@ -206,7 +270,10 @@ class MainWindow(QMainWindow):
 
         # Use your SVG here; replace filename if you have a dedicated "drop-files.svg"
         svg_path = resource_path("icons/download-icon.svg")
-        drop_svg = QSvgWidget(str(svg_path), panel)
+        primary_color = get_primary_color()
+        # Pre-rendered and tinted once; a colorize effect would re-render on every paint.
+        drop_svg = QLabel(panel)
+        drop_svg.setPixmap(tinted_svg_pixmap(str(svg_path), primary_color, 100, self.devicePixelRatioF()))
         drop_svg.setStyleSheet("background: transparent; border: none;")
         drop_svg.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground, True)
 
@@ -215,7 +282,6 @@ class MainWindow(QMainWindow):
         drop_svg.setFixedSize(100, 100)  # tweak to taste
 
 
-        primary_color = get_primary_color()
         drop_caption = QLabel("Drop files or folders here", panel)
         drop_caption.setAlignment(Qt.AlignmentFlag.AlignCenter)
         drop_caption.setAccessibleDescription(
@@ -223,10 +289,6 @@ class MainWindow(QMainWindow):
         )
         # optional styling
         drop_caption.setStyleSheet(f"font-size: 16px; color: {primary_color};")
-        effect = QGraphicsColorizeEffect(drop_svg)
-        effect.setColor(QColor(primary_color))  # gleiche Farbe wie Caption
-        effect.setStrength(1.0)  # 0..1
-        drop_svg.setGraphicsEffect(effect)
 
         col.addWidget(drop_svg, 0, Qt.AlignmentFlag.AlignCenter)
         col.addWidget(drop_caption, 0, Qt.AlignmentFlag.AlignCenter)
@@ -236,6 +298,14 @@ class MainWindow(QMainWindow):
         col.addWidget(self.active_preset_label, 0, Qt.AlignmentFlag.AlignCenter)
 
 
+    def showEvent(self, event: QShowEvent) -> None:
+        """Build the drop panel on first show, keeping SVG setup off the startup path."""
+        if not self._drop_panel_built:
+            self._drop_panel_built = True
+            self.createDropPanel(self.drop_panel)
+            self._update_active_preset_label()
+        super().showEvent(event)
+
     # ---------- Drag & Drop ----------
     def dragEnterEvent(self, event: QDragEnterEvent) -> None:
         """Accept when URLs are present."""
@@ -248,7 +318,8 @@ class MainWindow(QMainWindow):
     def dropEvent(self, event: QDropEvent) -> None:
         """Collect files recursively and switch to progress view."""
         urls = event.mimeData().urls()
-        dropped = [Path(u.toLocalFile()) for u in urls]
+        # normpath gives the same native form Path() did (separators, trailing slash).
+        dropped = [os.path.normpath(u.toLocalFile()) for u in urls]
         self.stack.setCurrentIndex(1)  # show progress
         self.setAcceptDrops(False)  # block new drops during run
         self.progress_label.setText("Processing...")
@@ -256,24 +327,29 @@ class MainWindow(QMainWindow):
 
         # Collect files (recursively)
         self.all_paths = self.collect_paths(dropped)
-        self.progress_bar.setMaximum(len(self.all_paths) if self.all_paths else 1)
 
-        # worker threads
-        self.threads = [
-            FileCheckThread(
+        # Imported on first drop: the workers pull in NumPy and the audio
+        # checks, which are not needed to bring up the window.
+        from components.Threads import AudioFileCheckThread, FileCheckThread
+
+        # worker thread for the selected mode only
+        if self.combo.currentText() == "Filename Check":
+            self.thread = FileCheckThread(
                 files=self.all_paths,
                 schema=self.schema_items,
                 delimiter=self.schema_delimiter,
                 preset_name=self._active_preset_name(),
-            ),
-            AudioFileCheckThread(files=self.all_paths, checks=self.audio_checks),
-        ]
+            )
+        else:
+            self.thread = AudioFileCheckThread(files=self.all_paths, checks=self.audio_checks)
 
-        self.thread = self.threads[self.combo.currentIndex()]
         self.filename_summary_text = ""
-        self.thread.progress_size_updated.connect(lambda x: self.progress_bar.setMaximum(x))
-        self.thread.progress_bar_updated.connect(lambda x: self.progress_bar.setValue(x))
-        self.thread.progress_label_updated.connect(lambda text: self.progress_label.setText(text))
+        # Direct slot connections: the workers already limit how often they emit
+        # (see Threads.PROGRESS_STEPS), so no Python-side throttling is needed here.
+        self.thread.progress_size_updated.connect(self.progress_bar.setMaximum)
+        self.thread.progress_bar_updated.connect(self.progress_bar.setValue)
+        self.thread.progress_label_updated.connect(self.progress_label.setText)
+        self.thread.results_document_ready.connect(self.on_results_document_ready)
         self.thread.results_ready.connect(self.on_thread_results)
         self.thread.finished.connect(self.on_thread_finished)
         if isinstance(self.thread, FileCheckThread):
@@ -282,8 +358,23 @@ class MainWindow(QMainWindow):
 
 
     # ---------- Helpers ----------
+    def on_results_document_ready(self, doc: QTextDocument):
+        """Show the report document the worker already filled (see results_document)."""
+        doc.setDefaultFont(self.result_text.font())
+        # setDocument() deletes the editor's initial document itself; an earlier
+        # report is parented to the editor instead and is released here.
+        previous = self._report_doc
+        self.result_text.setDocument(doc)
+        doc.setParent(self.result_text)
+        self._report_doc = doc
+        # The editor owns the document now; release the worker's keep-alive reference.
+        self.thread.results_doc = None
+        if previous is not None:
+            previous.deleteLater()
+
     def on_thread_results(self, text: str):
-        self.result_text.setPlainText(text)
+        from components.Threads import FileCheckThread
+
         if "Total issues: 0" in text:
             self.result_status.setText("Congratulations! You're good to go! 🎉")
             if isinstance(self.thread, FileCheckThread):
@@ -321,24 +412,16 @@ class MainWindow(QMainWindow):
             return
         QApplication.clipboard().setText(text)
 
-    def collect_paths(self, inputs: List[Path]) -> List[str]:
+    def collect_paths(self, inputs: List[str]) -> List[str]:
         """Recursively collect files from dropped files/folders.
         Skips .DS_Store and non-existent paths.
         """
-        out: List[str] = []
-        for p in inputs:
-            if not p.exists():
-                continue
-            if p.is_dir():
-                for root, _dirs, files in os.walk(p):
-                    for f in files:
-                        if f == ".DS_Store":
-                            continue
-                        out.append(str(Path(root) / f))
-            else:
-                if p.name != ".DS_Store":
-                    out.append(str(p))
-        return out
+        if len(inputs) <= 1:
+            return [path for p in inputs for path in collect_input_paths(p)]
+        # Dropped items are independent; walk them concurrently, since the walk
+        # mostly waits on filesystem metadata (slow on network shares).
+        with ThreadPoolExecutor(max_workers=COLLECT_WORKERS) as pool:
+            return [path for paths in pool.map(collect_input_paths, inputs) for path in paths]
 
     def on_setup_clicked(self):
         """Stub for settings dialog of the current mode."""
@@ -398,13 +481,7 @@ class MainWindow(QMainWindow):
         self.settings.sync()
 
     def _active_preset_name(self) -> str:
-        for name, preset in SCHEMA_PRESETS.items():
-            if name == "Custom":
-                continue
-            preset_delimiter, preset_schema = preset
-            if preset_delimiter == self.schema_delimiter and preset_schema == self.schema_items:
-                return name
-        return "Custom"
+        return matching_preset_name(self.schema_delimiter, self.schema_items)
 
     def _update_active_preset_label(self) -> None:
         preset_name = self._active_preset_name()
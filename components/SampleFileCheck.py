@@ -1,26 +1,68 @@
+import os
+from functools import lru_cache
 from pathlib import Path
 import re
 from typing import Optional, Tuple
 from enum import Enum
 
-_SUFFIX_3DIGIT_RE = re.compile(r"-\d{3}$")
+_NOTE_RE = re.compile(r"^(?P<note>[A-Ga-g])(?P<accidental>#|b)?(?P<octave>-?\d+)$")
+_NOTE_BASE = {"C": 0, "D": 2, "E": 4, "F": 5, "G": 7, "A": 9, "B": 11}
+# Semitone offset from C in the same octave for every note/accidental spelling.
+# Cb and B# fall outside 0..11, which carries into the neighbouring octave.
+_NOTE_OFFSET = {
+    note + acc: base + shift
+    for note, base in _NOTE_BASE.items()
+    for acc, shift in (("", 0), ("#", 1), ("b", -1))
+}
+_RR_RE = re.compile(r"RR-?(\d+)")
+_UP_DO_RE = re.compile(r"(UP|DO)(\d+)")
+_SEMITONES_RE = re.compile(r"[+-]?\d+(?:-[+-]?\d+)*")
+# Schema slots repeat a handful of distinct tokens across a sample set, so the
+# token validators below remember their verdicts.
+_TOKEN_CACHE_SIZE = 4096
+_DYNAMICS = ("ppp", "pp", "p", "mp", "mf", "f", "ff", "fff")
+# Position in _DYNAMICS; the softest marking wins when a stem has several.
+_DYNAMIC_RANK = {dyn: i for i, dyn in enumerate(_DYNAMICS)}
+
+
+def _stem(filename: str) -> str:
+    """Return the same result as Path(filename).stem without building a Path."""
+    cut = filename.rfind(os.sep)
+    if os.altsep:
+        cut = max(cut, filename.rfind(os.altsep))
+    name = filename[cut + 1:]
+    if name in ("", "."):
+        # Trailing separators and "." parts need Path's normalization.
+        return Path(filename).stem
+    dot = name.rfind(".")
+    return name[:dot] if 0 < dot < len(name) - 1 else name
+
+
+def file_stem(path: str) -> str:
+    """
+    Return the stem the filename checks work on for a sample path: the
+    extension is split off first, then the stem of the rest is taken.
+    """
+    return _stem(os.path.splitext(path)[0])
 
 
-def has_leading_or_trailing_whitespace(filename: str) -> bool:
-    """Return True if the filename stem has whitespace at the start or end."""
-    stem = Path(filename).stem
+def stem_has_leading_or_trailing_whitespace(stem: str) -> bool:
+    """Return True if a precomputed stem has whitespace at the start or end."""
     return stem != stem.strip()
 
 
-def has_dash_3digit_suffix(filename: str) -> bool:
-    """Return True if the filename stem ends with -001, -002, -010, etc."""
-    stem = Path(filename).stem
-    return bool(_SUFFIX_3DIGIT_RE.search(stem))
+def stem_has_dash_3digit_suffix(stem: str) -> bool:
+    """Return True if a precomputed stem ends with -001, -002, -010, etc."""
+    # Plain string checks equivalent to -\d{3}$ (isdecimal() is exactly \d,
+    # and "$" also matches before one final newline).
+    if stem.endswith("\n"):
+        stem = stem[:-1]
+    return stem[-4:-3] == "-" and stem[-3:].isdecimal()
 
 
 def split_by_delimiter(filename: str, delimiter: str = "_") -> list[str]:
     """Split the filename stem by the given delimiter and return the parts."""
-    stem = Path(filename).stem
+    stem = _stem(filename)
     return stem.split(delimiter)
 
 
@@ -41,76 +83,49 @@ class Wildcard(Enum):
     def __str__(self) -> str:
         return self.value
 
+
+# Schema strings -> Wildcard; a dict hit instead of Enum value lookup (and its
+# ValueError on unknown names) for every schema slot of every file.
+WILDCARD_BY_VALUE = {wildcard.value: wildcard for wildcard in Wildcard}
+
+def _parse_note(token: str) -> Optional[int]:
+    """Return the MIDI note number (0-128) of a note token like C4, C#4 or Db3, else None."""
+    m = _NOTE_RE.match(token)
+    if not m:
+        return None
+    offset = _NOTE_OFFSET[m.group("note").upper() + (m.group("accidental") or "")]
+    try:
+        octave = int(m.group("octave"), 10)
+    except ValueError:
+        return None
+
+    if octave < 0 or octave > 8:
+        return None
+
+    midi = (octave + 1) * 12 + offset
+    if 0 <= midi <= 128:
+        return midi
+    return None
+
+
 def get_root_key(filename: str, sep: str = "_") -> Optional[int]:
     """
     Searches for a MIDI note token (e.g., C0..C8, C#4, Db3) in filename parts.
     Returns the MIDI note number (0-128) or None.
     """
     parts = split_by_delimiter(filename, sep)
-    note_re = re.compile(r"^(?P<note>[A-Ga-g])(?P<accidental>#|b)?(?P<octave>-?\d+)$")
-    base = {"C": 0, "D": 2, "E": 4, "F": 5, "G": 7, "A": 9, "B": 11}
 
     for token in parts:
-        m = note_re.match(token)
-        if not m:
-            continue
-        note = m.group("note").upper()
-        acc = m.group("accidental")
-        try:
-            octave = int(m.group("octave"), 10)
-        except ValueError:
-            continue
-
-        if octave < 0 or octave > 8:
-            continue
-
-        semitone = base[note]
-        if acc == "#":
-            semitone += 1
-        elif acc == "b":
-            semitone -= 1
-
-        if semitone < 0:
-            semitone += 12
-            octave -= 1
-        elif semitone > 11:
-            semitone -= 12
-            octave += 1
-
-        midi = (octave + 1) * 12 + semitone
-        if 0 <= midi <= 128:
+        midi = _parse_note(token)
+        if midi is not None:
             return midi
 
     return None
 
 
+@lru_cache(maxsize=_TOKEN_CACHE_SIZE)
 def is_root_key_token(token: str) -> bool:
-    note_re = re.compile(r"^(?P<note>[A-Ga-g])(?P<accidental>#|b)?(?P<octave>-?\d+)$")
-    base = {"C": 0, "D": 2, "E": 4, "F": 5, "G": 7, "A": 9, "B": 11}
-    m = note_re.match(token)
-    if not m:
-        return False
-    note = m.group("note").upper()
-    acc = m.group("accidental")
-    try:
-        octave = int(m.group("octave"), 10)
-    except ValueError:
-        return False
-    if octave < 0 or octave > 8:
-        return False
-    semitone = base[note]
-    if acc == "#":
-        semitone += 1
-    elif acc == "b":
-        semitone -= 1
-    if semitone < 0:
-        semitone += 12
-        octave -= 1
-    elif semitone > 11:
-        semitone -= 12
-        octave += 1
-    midi = (octave + 1) * 12 + semitone
-    return 0 <= midi <= 128
+    return _parse_note(token) is not None
 
 
 def get_velocity(filename: str, sep: str = "_") -> Optional[Tuple[int, int]]:
@@ -136,6 +151,7 @@ def get_velocity(filename: str, sep: str = "_") -> Optional[Tuple[int, int]]:
     return None
 
 
+@lru_cache(maxsize=_TOKEN_CACHE_SIZE)
 def is_velocity_token(token: str) -> bool:
     if "-" not in token:
         return False
@@ -157,20 +173,20 @@ def get_dynamic(filename: str, sep: str = "_") -> Optional[str]:
     Searches for dynamic marking in filename.
     Returns dynamic string or None.
     """
-    dynamics = ["ppp", "pp", "p", "mp", "mf", "f", "ff", "fff"]
-
     parts = split_by_delimiter(filename, sep)
 
-    for dyn in dynamics:
-        if dyn in parts:
-            return dyn
+    dynamic = None
+    dynamic_rank = len(_DYNAMICS)
+    for token in parts:
+        rank = _DYNAMIC_RANK.get(token)
+        if rank is not None and rank < dynamic_rank:
+            dynamic, dynamic_rank = token, rank
 
-    return None
+    return dynamic
 
 
 def is_dynamic_token(token: str) -> bool:
-    dynamics = ["ppp", "pp", "p", "mp", "mf", "f", "ff", "fff"]
-    return token in dynamics
+    return token in _DYNAMIC_RANK
 
 
 def get_round_robin(filename: str, sep: str = "_") -> Optional[int]:
@@ -183,16 +199,17 @@ def get_round_robin(filename: str, sep: str = "_") -> Optional[int]:
     for token in parts:
         token_upper = token.upper()
         if "RR" in token_upper:
-            match = re.search(r"RR-?(\d+)", token_upper)
+            match = _RR_RE.search(token_upper)
             if match:
                 return int(match.group(1))
 
     return None
 
 
+@lru_cache(maxsize=_TOKEN_CACHE_SIZE)
 def is_round_robin_token(token: str) -> bool:
     token_upper = token.upper()
-    match = re.fullmatch(r"RR-?(\d+)", token_upper)
+    match = _RR_RE.fullmatch(token_upper)
     if not match:
         return False
     try:
@@ -201,21 +218,23 @@ def is_round_robin_token(token: str) -> bool:
         return False
     return True
 
+@lru_cache(maxsize=_TOKEN_CACHE_SIZE)
 def is_up_do_token(token: str) -> bool:
     token_upper = token.upper()
     # allow UP1 or DO1
-    match = re.fullmatch(r"(UP|DO)(\d+)", token_upper)
+    match = _UP_DO_RE.fullmatch(token_upper)
     if not match:
         return False
     try:
-        int(match.group(1))
+        int(match.group(2))
     except ValueError:
         return False
     return True
 
+@lru_cache(maxsize=_TOKEN_CACHE_SIZE)
 def is_semitones_token(token: str) -> bool:
     # allow a single number (optional + or -) or a hyphen-separated sequence like 1-5-1
-    if not re.fullmatch(r"[+-]?\d+(?:-[+-]?\d+)*", token):
+    if not _SEMITONES_RE.fullmatch(token):
         return False
     parts = token.split("-")
     for part in parts:
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
+from collections import Counter
 from typing import List
 
-from PySide6.QtCore import Qt
-from PySide6.QtGui import QColor
+from PySide6.QtCore import Qt, QTimer
 from PySide6.QtWidgets import (
     QAbstractItemView,
     QDialog,
@@ -21,6 +21,8 @@ from PySide6.QtWidgets import (
 from components.SampleFileCheck import Wildcard
 
 WILDCARDS = [wildcard.value for wildcard in Wildcard]
+# Typing and combo changes refresh the preview once input pauses this long.
+PREVIEW_DEBOUNCE_MS = 150
 
 SCHEMA_PRESETS = {
     "Custom": (None, None),
@@ -71,13 +73,21 @@ SCHEMA_PRESETS = {
     ),
 }
 
+# (delimiter, schema) -> preset name. Presets with the same layout resolve to
+# the first one listed, as a front-to-back scan over SCHEMA_PRESETS would.
+_PRESET_INDEX = {
+    (delimiter, tuple(schema)): name
+    for name, (delimiter, schema) in reversed(SCHEMA_PRESETS.items())
+    if delimiter is not None and schema is not None
+}
+
+
+def matching_preset_name(delimiter: str, schema: List[str]) -> str:
+    """Return the name of the preset with this delimiter and schema, else "Custom"."""
+    return _PRESET_INDEX.get((delimiter, tuple(schema)), "Custom")
 
-class SchemaSettingsDialog(QDialog):
-    @staticmethod
-    def _qcolor_to_rgba(color: QColor, alpha: float) -> str:
-        a = max(0, min(255, int(alpha * 255)))
-        return f"rgba({color.red()}, {color.green()}, {color.blue()}, {a})"
 
+class SchemaSettingsDialog(QDialog):
     def __init__(self, delimiter: str, schema: List[str], parent: QWidget | None = None):
         super().__init__(parent)
         self.setWindowTitle("File Schema Settings")
@@ -86,6 +96,13 @@ class SchemaSettingsDialog(QDialog):
         root = QVBoxLayout(self)
         root.setContentsMargins(20, 20, 20, 10)
 
+        # Set while rows are added in bulk; the preview is refreshed once afterwards.
+        self._bulk_loading = False
+        self._preview_timer = QTimer(self)
+        self._preview_timer.setSingleShot(True)
+        self._preview_timer.setInterval(PREVIEW_DEBOUNCE_MS)
+        self._preview_timer.timeout.connect(self.update_preview)
+
         # Presets row
         preset_row = QHBoxLayout()
         preset_row.addWidget(QLabel("Preset:", self))
@@ -122,6 +139,10 @@ class SchemaSettingsDialog(QDialog):
             QListWidget::item:selected {
                 background: transparent;
             }
+            QWidget#schemaRow {
+                background: transparent;
+                border-radius: 6px;
+            }
             """
         )
         root.addWidget(self.rows_list, 1)
@@ -154,15 +175,9 @@ class SchemaSettingsDialog(QDialog):
         footer.addWidget(self.ok_btn)
         root.addLayout(footer)
 
-        if schema:
-            for item in schema:
-                self.add_row(selected=item)
-        else:
-            self.add_row(selected="InstrumentName")
-            self.add_row(selected="Articulation")
-            self.add_row(selected="GroupName")
+        self._load_rows(schema or ["InstrumentName", "Articulation", "GroupName"])
 
-        self.delim_input.textChanged.connect(self.update_preview)
+        self.delim_input.textChanged.connect(self._schedule_preview)
         self.rows_list.model().rowsMoved.connect(self.update_preview)
         self.rows_list.model().rowsInserted.connect(self.update_preview)
         self.rows_list.model().rowsRemoved.connect(self.update_preview)
@@ -170,15 +185,7 @@ class SchemaSettingsDialog(QDialog):
 
     def add_row(self, selected: str | None = None) -> None:
         row = QWidget(self.rows_list)
-        row.setObjectName("schemaRow")
-        row.setStyleSheet(
-            """
-            QWidget#schemaRow {
-                background: transparent;
-                border-radius: 6px;
-            }
-            """
-        )
+        row.setObjectName("schemaRow")  # styled by the rows_list stylesheet
         layout = QHBoxLayout(row)
         layout.setContentsMargins(0,0,0,0)
         # layout.setSpacing(10)
@@ -187,7 +194,9 @@ class SchemaSettingsDialog(QDialog):
         combo.addItems(WILDCARDS)
         if selected and selected in WILDCARDS:
             combo.setCurrentText(selected)
-        combo.currentTextChanged.connect(self.update_preview)
+        combo.currentTextChanged.connect(self._schedule_preview)
+        # Kept on the row so get_schema does not have to search its children.
+        row._combo = combo
 
         remove_btn = QPushButton(row)
         # remove_btn.setFlat(True)
@@ -226,6 +235,18 @@ class SchemaSettingsDialog(QDialog):
                 row.setParent(None)
                 row.deleteLater()
 
+    def _load_rows(self, schema: List[str]) -> None:
+        """Replace all rows without repainting or refreshing the preview per row."""
+        self._bulk_loading = True
+        self.rows_list.setUpdatesEnabled(False)
+        try:
+            self.clear_rows()
+            for item in schema:
+                self.add_row(selected=item)
+        finally:
+            self.rows_list.setUpdatesEnabled(True)
+            self._bulk_loading = False
+
     def get_schema(self) -> List[str]:
         items: List[str] = []
         for i in range(self.rows_list.count()):
@@ -233,7 +254,7 @@ class SchemaSettingsDialog(QDialog):
             row = self.rows_list.itemWidget(item)
             if row is None:
                 continue
-            combo = row.findChild(QComboBox)
+            combo = getattr(row, "_combo", None)
             if combo is None:
                 continue
             items.append(combo.currentText())
@@ -243,7 +264,23 @@ class SchemaSettingsDialog(QDialog):
         text = self.delim_input.text()
         return text if text else "_"
 
+    def _schedule_preview(self, *_args) -> None:
+        """Restart the debounce timer; update_preview runs when input pauses."""
+        self._preview_timer.start()
+
+    def accept(self) -> None:
+        # Validate the latest edits before closing, even if the debounce is pending.
+        if self._preview_timer.isActive():
+            self._preview_timer.stop()
+            self.update_preview()
+            if not self.ok_btn.isEnabled():
+                return
+        super().accept()
+
     def update_preview(self) -> None:
+        if self._bulk_loading:
+            return
+        self._preview_timer.stop()
         delimiter = self.get_delimiter()
         schema = self.get_schema()
         self._sync_preset_combo(delimiter, schema)
@@ -258,18 +295,14 @@ class SchemaSettingsDialog(QDialog):
         if delimiter is None or schema is None:
             return
         self.delim_input.setText(delimiter)
-        self.clear_rows()
-        for item in schema:
-            self.add_row(selected=item)
+        self._load_rows(schema)
         self.update_preview()
 
     def _update_validation(self, schema: List[str]) -> None:
-        counts = {}
-        for item in schema:
-            if item == "Ignore":
-                continue
-            counts[item] = counts.get(item, 0) + 1
-        duplicates = [k for k, v in counts.items() if v > 1]
+        duplicates = []
+        if len(schema) > 1:  # a single row cannot repeat
+            counts = Counter(item for item in schema if item != "Ignore")
+            duplicates = [k for k, v in counts.items() if v > 1]
         if duplicates:
             self.warning_label.setText(
                 "Duplicates not allowed (except Ignore): " + ", ".join(duplicates)
@@ -280,13 +313,7 @@ class SchemaSettingsDialog(QDialog):
             self.ok_btn.setEnabled(True)
 
     def _matching_preset_name(self, delimiter: str, schema: List[str]) -> str:
-        for name, preset in SCHEMA_PRESETS.items():
-            if name == "Custom":
-                continue
-            preset_delim, preset_schema = preset
-            if preset_delim == delimiter and preset_schema == schema:
-                return name
-        return "Custom"
+        return matching_preset_name(delimiter, schema)
 
     def _sync_preset_combo(self, delimiter: str, schema: List[str]) -> None:
         target = self._matching_preset_name(delimiter, schema)
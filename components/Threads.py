@@ -1,39 +1,211 @@
+import io
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
-from PySide6.QtCore import QThread, Signal
+from PySide6.QtCore import QCoreApplication, QThread, Signal
+from PySide6.QtGui import QTextDocument
 
 from components.AudioFileCheck import (
-    is_wav_silent,
+    scan_wav,
+    scan_pcm,
     wav_riff_size_matches_file,
     wav_has_loop_points,
     wav_has_hard_edges,
-    wav_has_clipping,
 )
 from components.SampleFileCheck import (
+    WILDCARD_BY_VALUE,
     Wildcard,
-    has_dash_3digit_suffix,
-    has_leading_or_trailing_whitespace,
+    file_stem,
+    stem_has_dash_3digit_suffix,
+    stem_has_leading_or_trailing_whitespace,
     is_dynamic_token,
     is_root_key_token,
     is_round_robin_token,
     is_velocity_token,
-    split_by_delimiter, is_semitones_token, is_up_do_token, get_root_key, get_velocity, get_round_robin,
+    is_semitones_token, is_up_do_token, get_root_key, get_velocity, get_round_robin,
 )
 from utils.paths import shorten_path
 
 
+# File types each worker checks; everything else in a drop is skipped.
+# Tuples, so that str.endswith() can test them in one call.
+AUDIO_EXTENSIONS = (".wav", ".aiff", ".flac")
+WAV_EXTENSIONS = (".wav",)
+# Path separators; a name part made only of dots has no extension (see has_extension).
+_SEPARATORS = os.sep + (os.altsep or "")
+
+
+def has_extension(path: str, extensions: tuple) -> bool:
+    """
+    Return True if os.path.splitext(path)[1].lower() is one of the lower-case
+    `extensions`, with a single endswith() call for ordinary file names.
+    """
+    if not path.lower().endswith(extensions):
+        return False
+    dot = path.rfind(".")
+    if dot > 0 and path[dot - 1] not in _SEPARATORS and path[dot - 1] != ".":
+        return True
+    # Like splitext, dots that only lead the name (".wav", "..wav") are no extension.
+    head = path[:dot].rstrip(".")
+    return bool(head) and head[-1] not in _SEPARATORS
+
+
+# Workers signal progress about this many times per run, whatever the file count.
+PROGRESS_STEPS = 200
+# Minimum time between two progress signals of a worker (~20 updates per second).
+PROGRESS_INTERVAL_S = 0.05
+
+# WAV files handed to the check pool at a time (see batched_map).
+AUDIO_BATCH_SIZE = 256
+
+
+class ProgressThrottle:
+    """
+    Decides when a worker loop over `total` items reports progress: about
+    PROGRESS_STEPS times per run, at most once per PROGRESS_INTERVAL_S, plus
+    a final update at the end.
+    """
+
+    def __init__(self, total: int):
+        self.stride = max(1, total // PROGRESS_STEPS)
+        self.emitted = 0
+        self.last_emit = float("-inf")
+
+    def due(self, progress: int) -> bool:
+        if progress % self.stride:
+            return False
+        now = time.monotonic()
+        if now - self.last_emit < PROGRESS_INTERVAL_S:
+            return False
+        self.last_emit = now
+        self.emitted = progress
+        return True
+
+    def pending(self, progress: int) -> bool:
+        """True if `progress` has not been reported yet (use after the loop)."""
+        return progress != self.emitted
+
+
+def batched_map(pool, fn, items: list, batch_size: int):
+    """
+    Yield pool.map(fn, items) results in order, submitting `batch_size` items
+    at a time with one batch queued ahead, so the workers never run dry but a
+    large drop does not create a future per file up front.
+    """
+    ahead = None
+    for start in range(0, len(items), batch_size):
+        results = pool.map(fn, items[start:start + batch_size])
+        if ahead is not None:
+            yield from ahead
+        ahead = results
+    if ahead is not None:
+        yield from ahead
+
+
+def format_results(title: str, issues: dict) -> str:
+    """
+    Render the issue lists as the plain-text report shown in the result view.
+    The lists hold the full paths; they are shortened here, for display only.
+    """
+    buf = io.StringIO()
+    buf.write(f"{title}:\n\n")
+    for issue, files in issues.items():
+        buf.write(f"{issue}: {len(files)}\n")
+        buf.writelines(f"  - {shorten_path(f, 2)}\n" for f in files)
+        # if count > 10:
+        #     buf.write("  - ...\n")
+        buf.write("\n")
+    buf.write(f"Total issues: {sum(len(files) for files in issues.values())}")
+    return buf.getvalue()
+
+
+def results_document(text: str) -> QTextDocument:
+    """
+    Build the report as a QTextDocument in the calling worker thread and hand
+    it over to the GUI thread, so a long listing is not parsed on the UI thread.
+    The document has no parent: the worker keeps it in `results_doc` until the
+    GUI side re-parents it, since a queued signal carries only the C++ pointer.
+    """
+    doc = QTextDocument()
+    doc.setPlainText(text)
+    doc.moveToThread(QCoreApplication.instance().thread())
+    return doc
+
+
+# Token check per wildcard: (validator, issue reported when it rejects the token).
+TOKEN_CHECKS = {
+    Wildcard.VELO_MIN_MAX: (is_velocity_token, "Velocity Format"),
+    Wildcard.ROOT_KEY: (is_root_key_token, "RootKey Format"),
+    Wildcard.ROUND_ROBIN: (is_round_robin_token, "RoundRobin Format"),
+    Wildcard.DYNAMIC: (is_dynamic_token, "Dynamic Format"),
+    Wildcard.SEMITONES: (is_semitones_token, "Semitones Format"),
+    Wildcard.UP_DOWN: (is_up_do_token, "Up/Down Format"),
+}
+
+
+def schema_part_issues(parts: list[str], token_checks) -> list[str]:
+    """
+    Return the token format issues of one split stem.
+    `token_checks` holds (slot index, validator, issue) tuples.
+    """
+    return [issue for idx, validator, issue in token_checks if not validator(parts[idx])]
+
+
+def check_filename_stem(
+    stem: str,
+    delimiter: str,
+    schema_len: int,
+    token_checks,
+    parts: Optional[list[str]] = None,
+) -> list[str]:
+    """
+    Return the filename issues of one sample stem, in report order.
+    `parts` is the stem split by `delimiter`, if the caller already has it.
+    Pure function of its arguments (no thread or Qt state).
+    """
+    found = []
+    if stem_has_leading_or_trailing_whitespace(stem):
+        found.append("Leading/Trailing Whitespace")
+    if stem_has_dash_3digit_suffix(stem):
+        found.append("Reaper Suffix")
+    if schema_len:
+        # Counting the delimiters settles a length mismatch without splitting.
+        if stem.count(delimiter) + 1 != schema_len:
+            found.append("Schema Length Mismatch")
+        else:
+            if parts is None:
+                parts = stem.split(delimiter)
+            found.extend(schema_part_issues(parts, token_checks))
+    return found
+
+
 class FileCheckThread(QThread):
     progress_bar_updated = Signal(int)
     progress_label_updated = Signal(str)
     progress_size_updated = Signal(int)
     results_ready = Signal(str)
+    results_document_ready = Signal(QTextDocument)
     summary_ready = Signal(str)
 
-    def __init__(self, files, schema=None, delimiter: str = "_", preset_name: str = "Custom"):
+    def __init__(
+        self,
+        files,
+        schema=None,
+        delimiter: str = "_",
+        preset_name: str = "Custom",
+    ):
         super().__init__()
         self.files = files
+        # file_stem() of each entry in `files`; set by _select_audio_files().
+        self.stems = None
         self.schema = schema or []
+        self._schema_len = len(self.schema)
+        # Wildcard name -> slot; reversed so a repeated wildcard maps to its first slot.
+        self._schema_map = {raw: idx for idx, raw in reversed(list(enumerate(self.schema)))}
+        # Resolved once instead of per file and slot.
+        self._token_checks = self._schema_token_checks()
         self.delimiter = delimiter
         self.preset_name = preset_name
         self.issues = {
@@ -48,45 +220,63 @@ class FileCheckThread(QThread):
             "Dynamic Format": [],
         }
         self.summary_text = ""
+        # Report document in flight to the GUI thread (see results_document).
+        self.results_doc = None
 
     def append_issue(self, issue: str, file: str) -> None:
-        shortened = shorten_path(file, 2)
-        self.issues[issue].append(shortened)
+        # Keep a reference to the path string; it is only shortened when rendered.
+        self.issues[issue].append(file)
+
+    def _select_audio_files(self) -> None:
+        """Narrow files to the audio files and compute their stems."""
+        self.files = [f for f in self.files if has_extension(f, AUDIO_EXTENSIONS)]
+        self.stems = [file_stem(f) for f in self.files]
 
     def run(self):
-        self.progress_size_updated.emit(len(self.files))
+        # Filter up front so the progress range only counts files that get checked.
+        self._select_audio_files()
+        if self.files:
+            # An empty range would turn the bar into a busy indicator.
+            self.progress_size_updated.emit(len(self.files))
         progress = 0
-        for f in self.files:
-            file_name, file_ext = os.path.splitext(f)
-            if file_ext.lower() not in [".wav", ".aiff", ".flac"]:
-                continue
-
-            has_whitespace = has_leading_or_trailing_whitespace(file_name)
-            if has_whitespace:
-                self.append_issue("Leading/Trailing Whitespace", f)
-
-            has_reaper_suffix = has_dash_3digit_suffix(file_name)
-            if has_reaper_suffix:
-                self.append_issue("Reaper Suffix", f)
-
-            parts = split_by_delimiter(file_name, self.delimiter)
-            if self.schema:
-                if len(parts) != len(self.schema):
-                    self.append_issue("Schema Length Mismatch", f)
-                else:
-                    self._check_schema_parts(parts, f)
+        throttle = ProgressThrottle(len(self.files))
+        # The split stems double as the summary rows, which are only needed
+        # (and only kept) while no file has reported an issue.
+        rows = []
+        # Loop invariants as locals: the body runs once per sample.
+        check = check_filename_stem
+        append_issue = self.append_issue
+        delimiter = self.delimiter
+        schema_len = self._schema_len
+        token_checks = self._token_checks
+        due = throttle.due
+        for f, stem in zip(self.files, self.stems):
+            parts = stem.split(delimiter) if rows is not None else None
+            found = check(stem, delimiter, schema_len, token_checks, parts)
+            if found:
+                rows = None
+                for issue in found:
+                    append_issue(issue, f)
+            elif rows is not None:
+                rows.append(parts)
 
             progress += 1
+            if due(progress):
+                self.progress_bar_updated.emit(progress)
+                self.progress_label_updated.emit(f)
+        if throttle.pending(progress):
             self.progress_bar_updated.emit(progress)
-            self.progress_label_updated.emit(f)
 
         total_issues = self.total_issues()
         if total_issues == 0:
-            self.summary_text = self.build_summary()
+            self.summary_text = self.build_summary(rows)
         else:
             self.summary_text = ""
         self.summary_ready.emit(self.summary_text)
-        self.results_ready.emit(self.results_text())
+        text = self.results_text()
+        self.results_doc = results_document(text)
+        self.results_document_ready.emit(self.results_doc)
+        self.results_ready.emit(text)
         print("[INFO] File check complete. Issues found:")
         for issue, files in self.issues.items():
             print(f"  {issue}: {len(files)} files")
@@ -95,74 +285,41 @@ class FileCheckThread(QThread):
         return sum(len(files) for files in self.issues.values())
 
     def results_text(self) -> str:
-        lines = ["Filename Check Results:", ""]
-        total = 0
-        for issue, files in self.issues.items():
-            count = len(files)
-            total += count
-            lines.append(f"{issue}: {count}")
-            for f in files:
-                lines.append(f"  - {f}")
-            # if count > 10:
-            #     lines.append("  - ...")
-            lines.append("")
-        lines.append(f"Total issues: {total}")
-        return "\n".join(lines)
-
-    def build_summary(self) -> str:
-        self.progress_size_updated.emit(len(self.files))
-        self.progress_label_updated.emit("Building filename summary...")
-        progress = 0
+        return format_results("Filename Check Results", self.issues)
 
+    def build_summary(self, rows: Optional[list] = None) -> str:
+        """
+        Summarize the sample set. `rows` are the split stems gathered by run();
+        without them the files are split here in a separate pass.
+        """
         instrument_idx = self._schema_index(Wildcard.INSTRUMENT_NAME)
         articulation_idx = self._schema_index(Wildcard.ARTICULATION)
         root_idx = self._schema_index(Wildcard.ROOT_KEY)
         velo_idx = self._schema_index(Wildcard.VELO_MIN_MAX)
         rr_idx = self._schema_index(Wildcard.ROUND_ROBIN)
 
-        instruments = set()
-        articulations = set()
-        min_root = None
-        max_root = None
-        velocities = set()
-        round_robins = set()
-
-        for f in self.files:
-            stem, ext = os.path.splitext(f)
-            if ext.lower() not in (".wav", ".aiff", ".flac"):
-                continue
-
-            parts = split_by_delimiter(stem, self.delimiter)
-            if self.schema and len(parts) != len(self.schema):
-                continue
-
-            if instrument_idx is not None:
-                instrument_name = parts[instrument_idx].strip()
-                instruments.add(instrument_name)
-
-            if articulation_idx is not None:
-                articulation = parts[articulation_idx].strip()
-                articulations.add(articulation)
-
-            if root_idx is not None:
-                midi = get_root_key(parts[root_idx])
-                if midi is not None:
-                    min_root = midi if min_root is None else min(min_root, midi)
-                    max_root = midi if max_root is None else max(max_root, midi)
-
-            if velo_idx is not None:
-                velo = get_velocity(parts[velo_idx])
-                if velo is not None:
-                    velocities.add(velo)
-
-            if rr_idx is not None:
-                rr = get_round_robin(parts[rr_idx])
-                if rr is not None:
-                    round_robins.add(rr)
-
-            progress += 1
-            self.progress_bar_updated.emit(progress)
-            self.progress_label_updated.emit(f)
+        if rows is None:
+            summary_slots = (instrument_idx, articulation_idx, root_idx, velo_idx, rr_idx)
+            # Without any summary slot in the schema there is nothing to read from the stems.
+            rows = self._summary_rows() if any(idx is not None for idx in summary_slots) else []
+
+        # Evaluate the summary column by column: sample sets repeat the same few
+        # tokens per slot, so each distinct token is parsed only once.
+        def column(idx: Optional[int]) -> set[str]:
+            return {parts[idx] for parts in rows} if idx is not None else set()
+
+        def parsed(idx: Optional[int], parse) -> set:
+            values = {parse(token) for token in column(idx)}
+            values.discard(None)
+            return values
+
+        instruments = {token.strip() for token in column(instrument_idx)}
+        articulations = {token.strip() for token in column(articulation_idx)}
+        roots = parsed(root_idx, get_root_key)
+        min_root = min(roots) if roots else None
+        max_root = max(roots) if roots else None
+        velocities = parsed(velo_idx, get_velocity)
+        round_robins = parsed(rr_idx, get_round_robin)
 
         instrument_text = ", ".join(sorted(instruments)) if instruments else "-"
         articulation_text = ", ".join(sorted(articulations)) if articulations else "-"
@@ -179,11 +336,31 @@ class FileCheckThread(QThread):
             f"Round Robins: {len(round_robins)}"
         )
 
+    def _summary_rows(self) -> list:
+        """Split every stem that fits the schema, for build_summary()."""
+        if self.stems is None:
+            self._select_audio_files()
+        if self.files:
+            self.progress_size_updated.emit(len(self.files))
+        self.progress_label_updated.emit("Building filename summary...")
+        progress = 0
+        throttle = ProgressThrottle(len(self.files))
+        rows = []
+        for f, stem in zip(self.files, self.stems):
+            parts = stem.split(self.delimiter)
+            if not self._schema_len or len(parts) == self._schema_len:
+                rows.append(parts)
+
+            progress += 1
+            if throttle.due(progress):
+                self.progress_bar_updated.emit(progress)
+                self.progress_label_updated.emit(f)
+        if throttle.pending(progress):
+            self.progress_bar_updated.emit(progress)
+        return rows
+
     def _schema_index(self, wildcard: Wildcard) -> Optional[int]:
-        try:
-            return self.schema.index(wildcard.value)
-        except ValueError:
-            return None
+        return self._schema_map.get(wildcard.value)
 
     @staticmethod
     def _midi_to_note(midi: int) -> str:
@@ -192,29 +369,14 @@ class FileCheckThread(QThread):
         octave = (midi // 12) - 1
         return f"{note}{octave}"
 
-    def _check_schema_parts(self, parts, file_path: str) -> None:
+    def _schema_token_checks(self) -> list:
+        """(slot index, validator, issue) for every checked schema slot."""
+        checks = []
         for idx, raw in enumerate(self.schema):
-            try:
-                wildcard = Wildcard(raw)
-            except ValueError:
-                continue
-            token = parts[idx]
-
-            if wildcard == Wildcard.IGNORE:
-                continue
-            if wildcard == Wildcard.VELO_MIN_MAX and not is_velocity_token(token):
-                self.append_issue("Velocity Format", file_path)
-            elif wildcard == Wildcard.ROOT_KEY and not is_root_key_token(token):
-                self.append_issue("RootKey Format", file_path)
-            elif wildcard == Wildcard.ROUND_ROBIN and not is_round_robin_token(token):
-                self.append_issue("RoundRobin Format", file_path)
-            elif wildcard == Wildcard.DYNAMIC and not is_dynamic_token(token):
-                self.append_issue("Dynamic Format", file_path)
-            elif wildcard == Wildcard.SEMITONES and not is_semitones_token(token):
-                self.append_issue("Semitones Format", file_path)
-            elif wildcard == Wildcard.UP_DOWN and is_up_do_token(token):
-                self.append_issue("Up/Down Format", file_path)
-
+            wildcard = WILDCARD_BY_VALUE.get(raw)
+            if wildcard in TOKEN_CHECKS:
+                checks.append((idx, *TOKEN_CHECKS[wildcard]))
+        return checks
 
 
 class AudioFileCheckThread(QThread):
@@ -222,6 +384,7 @@ class AudioFileCheckThread(QThread):
     progress_label_updated = Signal(str)
     progress_size_updated = Signal(int)
     results_ready = Signal(str)
+    results_document_ready = Signal(QTextDocument)
 
     def __init__(self, files, checks=None):
         super().__init__()
@@ -235,6 +398,7 @@ class AudioFileCheckThread(QThread):
         }
         if isinstance(checks, dict):
             self.checks.update({k: bool(v) for k, v in checks.items()})
+        self._enabled = self._enabled_checks()
         self.issues = {
             "Silent Audio": [],
             "RIFF Size Mismatch": [],
@@ -243,52 +407,89 @@ class AudioFileCheckThread(QThread):
             "Clipping Detected": [],
             "Unreadable WAV": [],
         }
+        # Report document in flight to the GUI thread (see results_document).
+        self.results_doc = None
 
     def append_issue(self, issue: str, file: str) -> None:
-        self.issues[issue].append(shorten_path(file, 2))
+        self.issues[issue].append(file)
+
+    def _enabled_checks(self) -> tuple:
+        """The check switches in check_file order, so a file costs one tuple unpack."""
+        checks = self.checks
+        return (
+            checks["wav_riff_size_matches_file"],
+            checks["wav_has_loop_points"],
+            checks["wav_has_hard_edges"],
+            checks["is_wav_silent"],
+            checks["wav_has_clipping"],
+        )
+
+    def check_file(self, f: str) -> list[str]:
+        """Run the enabled checks on one WAV file and return the issues found."""
+        check_riff, check_loops, check_edges, check_silence, check_clipping = self._enabled
+        found = []
+        try:
+            # Parse the header once and share it between all checks.
+            wav = scan_wav(f)
+            if wav.riff_size is None:
+                # Empty or not RIFF/WAVE: nothing to compare the header checks against.
+                return ["Unreadable WAV"]
+            # Header checks only compare parsed fields; run them first so their
+            # findings are kept even if the sample data turns out unreadable.
+            if check_riff and not wav_riff_size_matches_file(wav):
+                found.append("RIFF Size Mismatch")
+            if check_loops and not wav_has_loop_points(wav):
+                found.append("Missing Loop Points")
+            # Sample checks, cheapest first: two short edge windows, then a
+            # single pass over the data chunk shared by silence and clipping.
+            if check_edges and wav_has_hard_edges(wav):
+                found.append("Hard Start/End (No Zero Crossing)")
+            if check_silence or check_clipping:
+                pcm = scan_pcm(wav, silence=check_silence, clipping=check_clipping)
+                if pcm.silent:
+                    found.append("Silent Audio")
+                if pcm.clipping:
+                    found.append("Clipping Detected")
+        except Exception:
+            found.append("Unreadable WAV")
+        return found
 
     def run(self):
-        self.progress_size_updated.emit(len(self.files))
+        # Pick up changes made to self.checks after construction.
+        self._enabled = self._enabled_checks()
+        wav_files = [f for f in self.files if has_extension(f, WAV_EXTENSIONS)]
+        # Visit the files folder by folder, keeping the order within a folder
+        # (stable sort), so reads stay local to one directory at a time.
+        wav_files.sort(key=os.path.dirname)
+        if wav_files:
+            self.progress_size_updated.emit(len(wav_files))
         progress = 0
-        for f in self.files:
-            _file_name, file_ext = os.path.splitext(f)
-            if file_ext.lower() != ".wav":
-                continue
-
-            try:
-                if self.checks["is_wav_silent"] and is_wav_silent(f):
-                    self.append_issue("Silent Audio", f)
-                if self.checks["wav_riff_size_matches_file"] and not wav_riff_size_matches_file(f):
-                    self.append_issue("RIFF Size Mismatch", f)
-                if self.checks["wav_has_loop_points"] and not wav_has_loop_points(f):
-                    self.append_issue("Missing Loop Points", f)
-                if self.checks["wav_has_hard_edges"] and wav_has_hard_edges(f):
-                    self.append_issue("Hard Start/End (No Zero Crossing)", f)
-                if self.checks["wav_has_clipping"] and wav_has_clipping(f):
-                    self.append_issue("Clipping Detected", f)
-            except Exception:
-                self.append_issue("Unreadable WAV", f)
-
-            progress += 1
+        throttle = ProgressThrottle(len(wav_files))
+        append_issue = self.append_issue
+        # Checks are dominated by file reads, so overlap them across workers.
+        # map() yields in submission order, keeping the report order stable.
+        # One core is left to the GUI thread that renders the progress.
+        workers = max(1, QThread.idealThreadCount() - 1)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = batched_map(pool, self.check_file, wav_files, AUDIO_BATCH_SIZE)
+            for f, found in zip(wav_files, results):
+                for issue in found:
+                    append_issue(issue, f)
+
+                progress += 1
+                if throttle.due(progress):
+                    self.progress_bar_updated.emit(progress)
+                    self.progress_label_updated.emit(f)
+        if throttle.pending(progress):
             self.progress_bar_updated.emit(progress)
-            self.progress_label_updated.emit(f)
 
-        self.results_ready.emit(self.results_text())
+        text = self.results_text()
+        self.results_doc = results_document(text)
+        self.results_document_ready.emit(self.results_doc)
+        self.results_ready.emit(text)
         print("[INFO] Audio file check complete. Issues found:")
         for issue, files in self.issues.items():
             print(f"  {issue}: {len(files)} files")
 
     def results_text(self) -> str:
-        lines = ["Audio File Check Results:", ""]
-        total = 0
-        for issue, files in self.issues.items():
-            count = len(files)
-            total += count
-            lines.append(f"{issue}: {count}")
-            for f in files:
-                lines.append(f"  - {f}")
-            # if count > 10:
-            #     lines.append("  - ...")
-            lines.append("")
-        lines.append(f"Total issues: {total}")
-        return "\n".join(lines)
+        return format_results("Audio File Check Results", self.issues)
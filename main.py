@@ -16,9 +16,9 @@ if __name__ == "__main__":
         QDir.addSearchPath("icon", str(theme_dir))
 
     win = MainWindow()
-    with open(resource_path('theme/dark_gold.qss'), 'r') as f:
-        qss = f.read()
-        app.setStyleSheet(qss)
+    # One sized read and a single decode; the stylesheet ships as UTF-8.
+    qss = resource_path('theme/dark_gold.qss').read_bytes().decode("utf-8")
+    app.setStyleSheet(qss)
     # apply_stylesheet(
     #     app,
     #     theme="theme/dark_gold.xml",
@@ -1,9 +1,13 @@
+import os
 import sys
+from functools import lru_cache
 from pathlib import Path
 
 
+@lru_cache(maxsize=None)
 def resource_path(rel_path: str) -> Path:
     """Get absolute path to resource, works for dev and for PyInstaller bundle."""
+    # The bundle/source root is fixed for the process, so results are cached.
     try:
         base_path = Path(sys._MEIPASS)  # type: ignore
     except Exception:
@@ -11,24 +15,31 @@ def resource_path(rel_path: str) -> Path:
     return base_path / rel_path
 
 
-def shorten_path(path: str | Path, num_parents: int) -> Path:
-    p = Path(path)
-    parts = p.parts
-
-    return Path(*parts[-num_parents:])
+def shorten_path(path: str | Path, num_parents: int) -> str:
+    """Return the last `num_parents` components of a normalized path, for display."""
+    path = os.fspath(path)
+    cut = len(path)
+    for _ in range(num_parents):
+        cut = max(path.rfind(os.sep, 0, cut), path.rfind(os.altsep, 0, cut) if os.altsep else -1)
+        if cut < 0:
+            return path
+    return path[cut + 1:] or path
 
 import xml.etree.ElementTree as ET
 
+@lru_cache(maxsize=1)
 def get_primary_color() -> str:
     # Use primaryColor from the local qt_material theme file if available.
+    # The theme ships with the app, so it is parsed once per process.
     primary_color = "#d4af37"
     try:
         theme_path = resource_path("theme/dark_gold.xml")
-        tree = ET.parse(theme_path)
-        for color_el in tree.getroot().iter("color"):
-            if color_el.attrib.get("name") == "primaryColor" and color_el.text:
-                primary_color = color_el.text.strip()
-                break
+        # Stream the elements and stop at primaryColor instead of building the tree.
+        with open(theme_path, "rb") as f:
+            for _event, color_el in ET.iterparse(f):
+                if color_el.tag == "color" and color_el.attrib.get("name") == "primaryColor" and color_el.text:
+                    primary_color = color_el.text.strip()
+                    break
     except Exception:
         pass
     return primary_color
\ No newline at end of file